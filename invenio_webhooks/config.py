@@ -33,3 +33,17 @@ Ultrahook for testing on development machines:
 """
 
 WEBHOOKS_SECRET_KEY = 'secret_key'
+
+WEBHOOKS_DEDUP_TTL = 0
+"""Number of seconds during which redelivered payloads are recognized.
+
+Providers retry deliveries which time out. A request with the same receiver,
+user and body as a recent one is answered with the existing event instead of
+creating and processing a new one. ``0`` disables the check.
+"""
+
+WEBHOOKS_DEDUP_SIZE = 10000
+"""Maximum number of recent deliveries remembered by each process."""
+
+WEBHOOKS_POOL_SIZE = 4
+"""Number of threads processing events of thread pool receivers."""
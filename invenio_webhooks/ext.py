@@ -26,7 +26,16 @@
 
 from __future__ import absolute_import, print_function
 
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from hashlib import sha256
+from threading import Lock
+from time import monotonic
+from types import MappingProxyType
+
 import pkg_resources
+from flask import url_for
 
 from . import config
 
@@ -37,19 +46,93 @@ class _WebhooksState(object):
     def __init__(self, app, entry_point_group=None):
         """Initialize state."""
         self.app = app
-        self.receivers = {}
+        self.receivers = MappingProxyType({})
+        self._lock = Lock()
+        self._deliveries = OrderedDict()
+        self._executor = None
+        # Cache hook URLs per application, since URL maps differ between
+        # applications even if they share a name.
+        self.build_hook_url = lru_cache(maxsize=1024)(self._build_hook_url)
 
         if entry_point_group:
             self.load_entry_point_group(entry_point_group)
 
+    @staticmethod
+    def _build_hook_url(url_root, receiver_id, access_token):
+        """Build the external URL of a receiver.
+
+        ``url_root`` is only part of the cache key, since the external URL
+        depends on the host it is served on.
+        """
+        return url_for(
+            'invenio_webhooks.event_list',
+            receiver_id=receiver_id,
+            access_token=access_token,
+            _external=True
+        )
+
+    @property
+    def debug_receiver_urls(self):
+        """Return receiver URL patterns used in debug and testing mode."""
+        if self.app.debug or self.app.testing:
+            return self.app.config.get('WEBHOOKS_DEBUG_RECEIVER_URLS') or {}
+        return {}
+
+    @property
+    def executor(self):
+        """Return the thread pool shared by thread pool receivers."""
+        if self._executor is None:
+            with self._lock:
+                if self._executor is None:
+                    self._executor = ThreadPoolExecutor(
+                        max_workers=self.app.config['WEBHOOKS_POOL_SIZE']
+                    )
+        return self._executor
+
+    def delivery_key(self, receiver_id, user_id, request):
+        """Return the key identifying the delivery of a request.
+
+        Return ``None`` without reading the request body if recognizing
+        redelivered payloads is disabled.
+        """
+        if self.app.config['WEBHOOKS_DEDUP_TTL']:
+            return receiver_id, user_id, sha256(request.get_data()).digest()
+
+    def find_delivery(self, key):
+        """Return the event identifier of a recent delivery with this key."""
+        if key is None:
+            return None
+        with self._lock:
+            entry = self._deliveries.get(key)
+        if entry and entry[1] > monotonic():
+            return entry[0]
+
+    def add_delivery(self, key, event_id):
+        """Remember the event created for a delivery."""
+        if key is None:
+            return
+        expires = monotonic() + self.app.config['WEBHOOKS_DEDUP_TTL']
+        with self._lock:
+            self._deliveries[key] = (event_id, expires)
+            self._deliveries.move_to_end(key)
+            while len(self._deliveries) > \
+                    self.app.config['WEBHOOKS_DEDUP_SIZE']:
+                self._deliveries.popitem(last=False)
+
     def register(self, receiver_id, receiver):
         """Register a receiver."""
-        assert receiver_id not in self.receivers
-        self.receivers[receiver_id] = receiver(receiver_id)
+        with self._lock:
+            assert receiver_id not in self.receivers
+            receivers = dict(self.receivers)
+            receivers[receiver_id] = receiver(receiver_id)
+            self.receivers = MappingProxyType(receivers)
 
     def unregister(self, receiver_id):
         """Unregister a receiver by its id."""
-        del self.receivers[receiver_id]
+        with self._lock:
+            receivers = dict(self.receivers)
+            del receivers[receiver_id]
+            self.receivers = MappingProxyType(receivers)
 
     def load_entry_point_group(self, entry_point_group):
         """Load actions from an entry point group."""
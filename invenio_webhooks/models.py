@@ -26,12 +26,12 @@
 
 from __future__ import absolute_import
 
-import re
+import json
 import uuid
 
-from celery import shared_task, states
+from celery import group, shared_task, states
 from celery.result import AsyncResult
-from flask import current_app, request, url_for
+from flask import current_app, has_request_context, request
 from invenio_accounts.models import User
 from invenio_db import db
 from sqlalchemy.dialects import postgresql
@@ -40,10 +40,49 @@ from sqlalchemy.orm.attributes import flag_modified
 from sqlalchemy_utils import JSONType, Timestamp, UUIDType
 
 from . import signatures
-from ._compat import delete_cached_json_for
 from .errors import InvalidPayload, InvalidSignature, ReceiverDoesNotExist
 from .proxies import current_webhooks
 
+try:
+    from orjson import loads as _orjson_loads
+except ImportError:
+    json_loads = json.loads
+else:
+    def json_loads(s):
+        """Parse JSON with orjson, falling back to the standard library.
+
+        orjson rejects integers wider than 64 bits and ``NaN``/``Infinity``,
+        which :func:`json.loads` accepts.
+        """
+        try:
+            return _orjson_loads(s)
+        except ValueError:
+            return json.loads(s)
+
+
+def _url_root():
+    """Return the URL root that ``url_for`` uses for external URLs."""
+    if has_request_context():
+        return request.url_root
+    config = current_app.config
+    return (config.get('PREFERRED_URL_SCHEME'), config.get('SERVER_NAME'),
+            config.get('APPLICATION_ROOT'))
+
+
+def _parse_json_payload():
+    """Parse a JSON request body."""
+    # Parse the body buffered for the signature check instead of letting
+    # ``get_json`` decode the request again.
+    try:
+        return json_loads(request.get_data())
+    except ValueError as e:
+        return request.on_json_loading_failed(e)
+
+
+def _parse_form_payload():
+    """Parse a form-encoded request body."""
+    return request.form.to_dict(flat=True)
+
 
 #
 # Models
@@ -59,6 +98,16 @@ class Receiver(object):
     signature = ''
     """Default signature."""
 
+    payload_parsers = {
+        'application/json': _parse_json_payload,
+        'application/x-www-form-urlencoded': _parse_form_payload,
+    }
+    """Payload parsers by request mimetype.
+
+    Other ``application/*+json`` bodies are parsed as JSON as well. Subclasses
+    can support further media types by extending a copy of this mapping.
+    """
+
     def __init__(self, receiver_id):
         """Initialize a receiver identifier."""
         self.receiver_id = receiver_id
@@ -71,6 +120,21 @@ class Receiver(object):
         """Implement method accepting the ``Event`` instance."""
         raise NotImplementedError()
 
+    def process_events(self, events):
+        """Hand several events over to the receiver.
+
+        Meant for applications creating several events at once outside of the
+        REST API, e.g. when replaying stored deliveries. The caller commits
+        the events before and after calling it.
+
+        Events are processed one by one through ``Event.process``, so a failing
+        event is recorded with a 500 response without aborting the batch.
+        Asynchronous receivers can override it to dispatch the whole batch at
+        once.
+        """
+        for event in events:
+            event.process()
+
     def status(self, event):
         """Return a tuple with current processing status code and message.
 
@@ -97,18 +161,13 @@ class Receiver(object):
                 github='http://github.userid.ultrahook.com',
             )
         """
+        state = current_webhooks._get_current_object()
         # Allow overwriting hook URL in debug mode.
-        if (current_app.debug or current_app.testing) and \
-           current_app.config.get('WEBHOOKS_DEBUG_RECEIVER_URLS', None):
-            url_pattern = current_app.config[
-                'WEBHOOKS_DEBUG_RECEIVER_URLS'].get(self.receiver_id, None)
-            if url_pattern:
-                return url_pattern % dict(token=access_token)
-        return url_for(
-            'invenio_webhooks.event_list',
-            receiver_id=self.receiver_id,
-            access_token=access_token,
-            _external=True
+        url_pattern = state.debug_receiver_urls.get(self.receiver_id)
+        if url_pattern:
+            return url_pattern % dict(token=access_token)
+        return state.build_hook_url(
+            _url_root(), self.receiver_id, access_token
         )
 
     #
@@ -118,33 +177,32 @@ class Receiver(object):
         """Check signature of signed request."""
         if not self.signature:
             return True
+        validator = signatures.VALIDATORS.get(self.signature.lower())
+        if validator is None:
+            return False
         signature_value = request.headers.get(self.signature, None)
         if signature_value:
-            validator = 'check_' + re.sub(r'[-]', '_', self.signature).lower()
-            check_signature = getattr(signatures, validator)
-            if check_signature(signature_value, request.data):
-                return True
+            return validator(signature_value, request.get_data())
         return False
 
     def extract_payload(self):
         """Extract payload from request."""
+        # Reject unsupported media types before hashing the body.
+        parser = self.payload_parsers.get(request.mimetype)
+        if parser is None:
+            if not request.is_json:
+                raise InvalidPayload(request.content_type)
+            parser = _parse_json_payload
         if not self.check_signature():
             raise InvalidSignature('Invalid Signature')
-        if request.is_json:
-            # Request.get_json() could be first called with silent=True.
-            delete_cached_json_for(request)
-            return request.get_json(silent=False, cache=False)
-        elif request.content_type == 'application/x-www-form-urlencoded':
-            return dict(request.form)
-        raise InvalidPayload(request.content_type)
+        return parser()
 
 
-@shared_task(bind=True, ignore_results=True)
-def process_event(self, event_id):
-    """Process event in Celery."""
+def _run_event(event_id, celery_task=None):
+    """Run the receiver of a stored event within a savepoint and commit."""
     with db.session.begin_nested():
         event = Event.query.get(event_id)
-        event._celery_task = self  # internal binding to a Celery task
+        event._celery_task = celery_task  # internal binding to a Celery task
         event.receiver.run(event)  # call run directly to avoid circular calls
         flag_modified(event, 'response')
         flag_modified(event, 'response_headers')
@@ -152,6 +210,12 @@ def process_event(self, event_id):
     db.session.commit()
 
 
+@shared_task(bind=True, ignore_results=True)
+def process_event(self, event_id):
+    """Process event in Celery."""
+    _run_event(event_id, celery_task=self)
+
+
 class CeleryReceiver(Receiver):
     """Asynchronous receiver.
 
@@ -174,9 +238,43 @@ class CeleryReceiver(Receiver):
     }
     """Celery states in which the task's status is reported."""
 
+    celery_options = {}
+    """Extra options passed to ``apply_async`` when firing the task.
+
+    Use it to route a receiver's events to a dedicated queue, e.g.:
+
+    .. code-block:: python
+
+        class GitHubReceiver(CeleryReceiver):
+            celery_options = {'queue': 'webhooks-github', 'priority': 9}
+    """
+
     def __call__(self, event):
         """Fire a celery task."""
-        process_event.apply_async(task_id=str(event.id), args=[str(event.id)])
+        event_id = str(event.id)
+        process_event.apply_async(
+            task_id=event_id, args=[event_id], **self.celery_options
+        )
+
+    def process_events(self, events):
+        """Fire celery tasks for all events as a single group.
+
+        Each task is still published as its own message, but the whole group
+        is sent through one producer instead of one per event. If the group
+        cannot be sent, every event is recorded with a 500 response.
+        """
+        events = list(events)
+        try:
+            group(
+                process_event.s(str(event.id)).set(
+                    task_id=str(event.id), **self.celery_options
+                )
+                for event in events
+            ).apply_async()
+        except Exception as e:
+            current_app.logger.exception('Could not process events.')
+            for event in events:
+                event.set_failed(e)
 
     def status(self, event):
         """Return a tuple with current processing status code and message."""
@@ -194,6 +292,38 @@ class CeleryReceiver(Receiver):
         AsyncResult(event.id).revoke(terminate=True)
 
 
+def _process_event_in_app(app, event_id):
+    """Process event in a worker thread of the shared thread pool."""
+    with app.app_context():
+        try:
+            _run_event(event_id)
+        except Exception as e:
+            # Nobody waits for the future, so record and log the failure.
+            current_app.logger.exception(
+                'Could not process event %s.', event_id
+            )
+            db.session.rollback()
+            event = Event.query.get(event_id)
+            if event is not None:
+                event.set_failed(e)
+                db.session.commit()
+
+
+class ThreadPoolReceiver(Receiver):
+    """Asynchronous receiver running events in a shared thread pool.
+
+    Like :class:`CeleryReceiver` it does not block the request while the event
+    is processed, but it does not require a Celery broker. It suits receivers
+    doing I/O. The pool size is set by ``WEBHOOKS_POOL_SIZE``.
+    """
+
+    def __call__(self, event):
+        """Submit the event to the thread pool and return the future."""
+        return current_webhooks.executor.submit(
+            _process_event_in_app, current_app._get_current_object(), event.id
+        )
+
+
 def _json_column(**kwargs):
     """Return JSON column."""
     return db.Column(
@@ -282,10 +412,14 @@ class Event(db.Model, Timestamp):
         # TODO RESTException
         except Exception as e:
             current_app.logger.exception('Could not process event.')
-            self.response_code = 500
-            self.response = dict(status=500, message=str(e))
+            self.set_failed(e)
         return self
 
+    def set_failed(self, error):
+        """Record a failure to process the event."""
+        self.response_code = 500
+        self.response = dict(status=500, message=str(error))
+
     @property
     def status(self):
         """Return a tuple with current processing status code and message."""
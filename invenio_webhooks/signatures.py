@@ -25,10 +25,23 @@
 """Calculate signatures for payloads."""
 
 import hmac
-from hashlib import sha1
 
 from flask import current_app
 
+_HMAC_TEMPLATES = {}
+"""HMAC objects keyed by secret key, with the key pads already computed."""
+
+
+def _get_hmac_template(key):
+    """Return an HMAC object initialized with ``key`` and no message."""
+    try:
+        return _HMAC_TEMPLATES[key]
+    except KeyError:
+        # Passing the digest by name lets CPython use OpenSSL's HMAC, which
+        # benefits from hardware SHA extensions where available.
+        template = _HMAC_TEMPLATES[key] = hmac.new(key, digestmod='sha1')
+        return template
+
 
 def get_hmac(message):
     """Calculate HMAC value of message using ``WEBHOOKS_SECRET_KEY``.
@@ -36,12 +49,13 @@ def get_hmac(message):
     :param message: String to calculate HMAC for.
     """
     key = current_app.config['WEBHOOKS_SECRET_KEY']
-    hmac_value = hmac.new(
-        key.encode('utf-8') if hasattr(key, 'encode') else key,
-        message.encode('utf-8') if hasattr(message, 'encode') else message,
-        sha1
-    ).hexdigest()
-    return hmac_value
+    mac = _get_hmac_template(
+        key.encode('utf-8') if hasattr(key, 'encode') else key
+    ).copy()
+    mac.update(
+        message.encode('utf-8') if hasattr(message, 'encode') else message
+    )
+    return mac.hexdigest()
 
 
 def check_x_hub_signature(signature, message):
@@ -50,9 +64,15 @@ def check_x_hub_signature(signature, message):
     :param signature: HMAC signature extracted from request.
     :param message: Request message.
     """
-    hmac_value = get_hmac(message)
-    if hmac_value == signature or \
-       (signature.find('=') > -1 and
-            hmac_value == signature[signature.find('=') + 1:]):
-        return True
-    return False
+    hmac_value = get_hmac(message).encode('ascii')
+    signature = signature.encode('utf-8')
+    return hmac.compare_digest(hmac_value, signature) or (
+        b'=' in signature and
+        hmac.compare_digest(hmac_value, signature.split(b'=', 1)[1])
+    )
+
+
+VALIDATORS = {
+    'x-hub-signature': check_x_hub_signature,
+}
+"""Signature validators by lower-cased name of the signature header."""
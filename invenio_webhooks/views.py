@@ -39,6 +39,7 @@ from invenio_oauth2server.models import Scope
 
 from .errors import InvalidPayload, ReceiverDoesNotExist, WebhooksError
 from .models import Event, Receiver
+from .proxies import current_webhooks
 
 blueprint = Blueprint('invenio_webhooks', __name__)
 
@@ -125,16 +126,35 @@ class ReceiverEventListResource(MethodView):
         except AttributeError:
             user_id = current_user.get_id()
 
+        # Read the body before the payload is parsed from the stream.
+        delivery = current_webhooks.delivery_key(
+            receiver_id, user_id, request
+        )
         event = Event.create(
             receiver_id=receiver_id,
             user_id=user_id
         )
+
+        # Answer retried deliveries with the event they already created,
+        # unless that event has failed or was deleted in the meantime.
+        event_id = current_webhooks.find_delivery(delivery)
+        if event_id is not None:
+            previous = Event.query.get(event_id)
+            if previous is not None:
+                code = previous.status[0]
+                if code is not None and code < 500 and code != 410:
+                    return make_response(previous)
+
         db.session.add(event)
         db.session.commit()
 
         # db.session.begin(subtransactions=True)
         event.process()
         db.session.commit()
+
+        # Failed deliveries must be processed again when the provider retries.
+        if event.response_code < 500:
+            current_webhooks.add_delivery(delivery, event.id)
         return make_response(event)
 
     def options(self, receiver_id=None):
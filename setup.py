@@ -46,6 +46,11 @@ extras_require = {
     'docs': [
         'Sphinx>=3',
     ],
+    # Faster JSON payload parsing. Payloads orjson rejects, such as integers
+    # wider than 64 bits or NaN, are still parsed with the json module.
+    'orjson': [
+        'orjson>=3.0',
+    ],
     'mysql': [
         'invenio-db[mysql]>=1.0.8',
     ],
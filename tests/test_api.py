@@ -146,6 +146,80 @@ def test_webhook_post(app, tester_id, access_token, receiver):
             )
 
 
+def test_webhook_post_redelivery(app, tester_id, access_token, receiver):
+    app.config['WEBHOOKS_DEDUP_TTL'] = 60
+    with app.test_request_context():
+        receiver = current_webhooks.receivers['test-receiver']
+        with app.test_client() as client:
+            responses = [
+                make_request(
+                    access_token,
+                    client.post,
+                    'invenio_webhooks.event_list',
+                    urlargs=dict(receiver_id='test-receiver'),
+                    data=payload,
+                    code=202,
+                )
+                for payload in (dict(key='a'), dict(key='a'), dict(key='b'))
+            ]
+
+            assert 2 == len(receiver.calls)
+            assert responses[0].headers['X-Hub-Delivery'] == \
+                responses[1].headers['X-Hub-Delivery']
+            assert responses[0].headers['X-Hub-Delivery'] != \
+                responses[2].headers['X-Hub-Delivery']
+
+            # Deleted events are not used to answer retries.
+            make_request(
+                access_token,
+                client.delete,
+                'invenio_webhooks.event_item',
+                urlargs=dict(
+                    receiver_id='test-receiver',
+                    event_id=responses[0].headers['X-Hub-Delivery'],
+                ),
+            )
+            response = make_request(
+                access_token,
+                client.post,
+                'invenio_webhooks.event_list',
+                urlargs=dict(receiver_id='test-receiver'),
+                data=dict(key='a'),
+                code=202,
+            )
+            assert 3 == len(receiver.calls)
+            assert responses[0].headers['X-Hub-Delivery'] != \
+                response.headers['X-Hub-Delivery']
+
+    class TestReceiverFailOnce(Receiver):
+
+        def __init__(self, *args, **kwargs):
+            super(TestReceiverFailOnce, self).__init__(*args, **kwargs)
+            self.calls = []
+
+        def run(self, event):
+            self.calls.append(event)
+            if len(self.calls) == 1:
+                raise RuntimeError('Temporary failure.')
+
+    with app.test_request_context():
+        current_webhooks.register('test-receiver-fail-once',
+                                  TestReceiverFailOnce)
+        receiver = current_webhooks.receivers['test-receiver-fail-once']
+        with app.test_client() as client:
+            for code in (500, 202, 202):
+                make_request(
+                    access_token,
+                    client.post,
+                    'invenio_webhooks.event_list',
+                    urlargs=dict(receiver_id='test-receiver-fail-once'),
+                    data=dict(key='a'),
+                    code=code,
+                )
+
+            assert 2 == len(receiver.calls)
+
+
 def test_webhook_post_no_token(app, tester_id, receiver):
     ds = app.extensions['security'].datastore
 
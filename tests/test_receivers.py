@@ -20,13 +20,15 @@
 from __future__ import absolute_import
 
 import json
+import uuid
+from unittest.mock import patch
 
 import pytest
 from flask import url_for
 from invenio_db import db
 
 from invenio_webhooks.models import CeleryReceiver, Event, InvalidPayload, \
-    InvalidSignature, Receiver, ReceiverDoesNotExist
+    InvalidSignature, Receiver, ReceiverDoesNotExist, ThreadPoolReceiver
 from invenio_webhooks.proxies import current_webhooks
 from invenio_webhooks.signatures import get_hmac
 
@@ -117,6 +119,13 @@ def test_hookurl(app, receiver):
             _external=True
         )
 
+    for host in ('http://first.local/', 'http://second.local/'):
+        with app.test_request_context(base_url=host):
+            assert current_webhooks.receivers['test-receiver'].get_hook_url(
+                'token'
+            ) == host + 'hooks/receivers/test-receiver/events/' \
+                '?access_token=token'
+
     app.config['WEBHOOKS_DEBUG_RECEIVER_URLS'] = {
         'test-receiver': 'http://test.local/?access_token=%(token)s'
     }
@@ -163,6 +172,34 @@ def test_signature_checking(app, receiver):
         with pytest.raises(InvalidSignature):
             Event.create(receiver_id='test-receiver-sign')
 
+    # check signature set on the instance after initialization
+    class TestReceiverSignInit(receiver):
+        def __init__(self, *args, **kwargs):
+            super(TestReceiverSignInit, self).__init__(*args, **kwargs)
+            self.signature = 'X-Hub-Signature'
+
+    with app.app_context():
+        current_webhooks.register('test-receiver-sign-init',
+                                  TestReceiverSignInit)
+    with app.test_request_context(
+            headers=[('Content-Type', 'application/json')], data=payload):
+        with pytest.raises(InvalidSignature):
+            Event.create(receiver_id='test-receiver-sign-init')
+    with app.test_request_context(headers=headers, data=payload):
+        with pytest.raises(InvalidSignature):
+            Event.create(receiver_id='test-receiver-sign-init')
+    with app.app_context():
+        headers = [('Content-Type', 'application/json'),
+                   ('X-Hub-Signature', get_hmac(payload))]
+    with app.test_request_context(headers=headers, data=payload):
+        event = Event.create(receiver_id='test-receiver-sign-init')
+        assert json.loads(payload) == event.payload
+
+    # check unsupported content type is rejected before the signature
+    with app.test_request_context(method='POST', data='invaliddata'):
+        with pytest.raises(InvalidPayload):
+            Event.create(receiver_id='test-receiver-sign')
+
 
 def test_event_deletion(app, receiver):
     """Test event deletion."""
@@ -212,3 +249,132 @@ def test_event_status(app):
         event = Event.query.get(event_id)
         assert event.status == (201, 42)
         assert event.response['message'] == 42
+
+
+def test_celery_receiver_process_events(app):
+    """Test dispatching several events at once."""
+    calls = []
+
+    class TestCeleryReceiver(CeleryReceiver):
+
+        def run(self, event):
+            calls.append(event.payload)
+
+    app.extensions['invenio-webhooks'].register('celery-receiver',
+                                                TestCeleryReceiver)
+
+    event_ids = []
+    for value in ('first', 'second'):
+        with app.test_request_context(method='POST', data=dict(key=value)):
+            event = Event.create(receiver_id='celery-receiver')
+            db.session.add(event)
+            db.session.commit()
+            event_ids.append(event.id)
+
+    with app.app_context():
+        events = [Event.query.get(event_id) for event_id in event_ids]
+        current_webhooks.receivers['celery-receiver'].process_events(events)
+
+    assert [dict(key='first'), dict(key='second')] == calls
+
+
+def test_celery_receiver_options(app):
+    """Test forwarding Celery options when firing tasks."""
+    class TestCeleryReceiver(CeleryReceiver):
+        celery_options = {'queue': 'webhooks-test', 'priority': 9}
+
+        def run(self, event):
+            pass
+
+    receiver = TestCeleryReceiver('celery-receiver')
+    events = [Event(id=uuid.uuid4()), Event(id=uuid.uuid4())]
+
+    with app.app_context():
+        with patch('invenio_webhooks.models.process_event') as process_event:
+            receiver(events[0])
+        process_event.apply_async.assert_called_once_with(
+            task_id=str(events[0].id), args=[str(events[0].id)],
+            queue='webhooks-test', priority=9,
+        )
+
+        with patch('invenio_webhooks.models.group') as group:
+            receiver.process_events(events)
+        tasks = list(group.call_args[0][0])
+        assert [dict(task.options) for task in tasks] == [
+            dict(task_id=str(event.id), queue='webhooks-test', priority=9)
+            for event in events
+        ]
+        assert [list(task.args) for task in tasks] == [
+            [str(event.id)] for event in events
+        ]
+
+
+def test_celery_receiver_process_events_failure(app):
+    """Test recording a failure to dispatch several events."""
+    class TestCeleryReceiver(CeleryReceiver):
+
+        def run(self, event):
+            pass
+
+    receiver = TestCeleryReceiver('celery-receiver')
+    events = [Event(id=uuid.uuid4()), Event(id=uuid.uuid4())]
+
+    with app.app_context():
+        with patch('invenio_webhooks.models.group') as group:
+            group.return_value.apply_async.side_effect = \
+                RuntimeError('Broker down.')
+            receiver.process_events(events)
+
+    for event in events:
+        assert event.response_code == 500
+        assert event.response == {'status': 500, 'message': 'Broker down.'}
+
+
+def test_thread_pool_receiver(app):
+    """Test processing events in the shared thread pool."""
+    calls = []
+
+    class TestThreadPoolReceiver(ThreadPoolReceiver):
+
+        def run(self, event):
+            calls.append(event.payload)
+            event.response['message'] = 'Done.'
+
+    app.extensions['invenio-webhooks'].register('thread-receiver',
+                                                TestThreadPoolReceiver)
+
+    with app.test_request_context(method='POST', data=dict(key='value')):
+        event = Event.create(receiver_id='thread-receiver')
+        db.session.add(event)
+        db.session.commit()
+        event_id = event.id
+        event.receiver(event).result()
+
+    with app.app_context():
+        event = Event.query.get(event_id)
+        assert event.response['message'] == 'Done.'
+    assert [dict(key='value')] == calls
+
+
+def test_thread_pool_receiver_failure(app):
+    """Test recording failures of events processed in the thread pool."""
+    class TestThreadPoolReceiver(ThreadPoolReceiver):
+
+        def run(self, event):
+            event.response['message'] = 'Half done.'
+            raise RuntimeError('Failed.')
+
+    app.extensions['invenio-webhooks'].register('thread-receiver',
+                                                TestThreadPoolReceiver)
+
+    with app.test_request_context(method='POST', data=dict(key='value')):
+        event = Event.create(receiver_id='thread-receiver')
+        db.session.add(event)
+        db.session.commit()
+        event_id = event.id
+        event.receiver(event).result()
+
+    with app.app_context():
+        event = Event.query.get(event_id)
+        assert event.response_code == 500
+        assert event.response == {'status': 500, 'message': 'Failed.'}